@@ -0,0 +1,172 @@
+"""Pure position-sizing math shared by the calculator UI."""
+from dataclasses import dataclass
+from decimal import Context, Decimal, localcontext
+from typing import Optional
+
+import streamlit as st
+
+# Arithmetic context for the compute stages. Used via localcontext() so the
+# results do not depend on whatever thread-local context the caller has.
+_CTX = Context(prec=16)
+
+# Smallest price gap treated as non-zero; far below the 8-decimal tick
+_EPS = Decimal("1e-12")
+
+# Largest price magnitude accepted; keeps products well inside Decimal's exponent range
+_MAX_PRICE = Decimal("1e12")
+
+# side -> (liquidation sign, move-to-target sign)
+_SIDE_SIGNS = {"Long": (-1, 1), "Short": (1, -1)}
+
+
+@dataclass(frozen=True, slots=True)
+class PriceInvariants:
+    """Results that depend only on the prices, leverage and side."""
+    entry: Decimal
+    inv_lev: Decimal
+    risk_per_unit: Decimal
+    inv_rpu: Decimal
+    reward_per_unit: Decimal
+    risk_reward_ratio: Decimal
+    liq: Decimal
+    move_to_target: Decimal
+    entry_stop_pct: Decimal
+    entry_liq_pct: Decimal
+    stop_liq_pct: Optional[Decimal]
+
+
+@dataclass(frozen=True, slots=True)
+class Sizing:
+    """Results that also depend on dollar risk, DCA split and balance."""
+    total_pos_units: Decimal
+    total_notional: Decimal
+    entry_units: Decimal
+    dca_units: Decimal
+    entry_notional: Decimal
+    dca_notional: Decimal
+    margin_full: Decimal
+    margin_entry: Decimal
+    margin_dca: Decimal
+    account_risk_pct: Decimal
+    pnl_target_full: Decimal
+    risk_entry_only: Decimal
+
+
+@st.cache_data(max_entries=64)
+def parse_price(s: str) -> Decimal:
+    """Parse a price text input; cached because the strings rarely change between reruns."""
+    price = Decimal(s)
+    if not price.is_finite():
+        raise ValueError(f"{s!r} is not a finite number")
+    return price
+
+
+def validate(entry, stop, target, risk, leverage, account_balance) -> Optional[str]:
+    """Return an error message for unusable inputs, or None if the math is safe."""
+    if max(abs(entry), abs(stop), abs(target)) >= _MAX_PRICE:
+        return "Entry, Stop-Loss, and Target must be smaller than 1e12 in absolute value."
+    if entry < _EPS:
+        return "Entry Price must be greater than 0."
+    if abs(entry - stop) < _EPS:
+        return "Entry and Stop-Loss cannot be identical."
+    if risk <= 0:
+        return "Dollar Risk must be greater than 0."
+    if leverage < 1:
+        return "Leverage must be at least 1×."
+    if account_balance <= 0:
+        return "Account Balance must be greater than 0."
+    return None
+
+
+@st.cache_data(max_entries=128)
+def compute_price_invariants(entry, stop, target, leverage, side) -> PriceInvariants:
+    """Price-only half of the math; unaffected by risk or DCA changes.
+
+    Expects inputs that already passed validate().
+    """
+    with localcontext(_CTX):
+        risk_per_unit = abs(entry - stop)
+
+        # Shared reciprocals; validate() guarantees leverage >= 1 and |entry - stop| >= _EPS
+        inv_lev = 1 / leverage
+        inv_rpu = 1 / risk_per_unit
+
+        # Risk:Reward ratio (per unit)
+        reward_per_unit = abs(target - entry)
+        risk_reward_ratio = reward_per_unit * inv_rpu
+
+        # Simple liquidation approximation
+        sign_liq, sign_tgt = _SIDE_SIGNS[side]
+        liq = entry * (1 + sign_liq * inv_lev)
+        move_to_target = sign_tgt * (target - entry)
+
+        # % distances (scale factors computed once, then multiplied through)
+        inv_entry_100 = 100 / entry
+        entry_stop_pct = risk_per_unit * inv_entry_100
+        entry_liq_pct = abs(entry - liq) * inv_entry_100
+        stop_liq_pct = (abs(stop - liq) / stop) * 100 if stop > _EPS else None
+
+        return PriceInvariants(
+            entry=entry,
+            inv_lev=inv_lev,
+            risk_per_unit=risk_per_unit,
+            inv_rpu=inv_rpu,
+            reward_per_unit=reward_per_unit,
+            risk_reward_ratio=risk_reward_ratio,
+            liq=liq,
+            move_to_target=move_to_target,
+            entry_stop_pct=entry_stop_pct,
+            entry_liq_pct=entry_liq_pct,
+            stop_liq_pct=stop_liq_pct,
+        )
+
+
+@st.cache_data(max_entries=128)
+def compute_sizing(invariants, risk, dca_pct, account_balance) -> Sizing:
+    """Position sizing on top of compute_price_invariants(); cheap to redo on DCA changes."""
+    with localcontext(_CTX):
+        inv = invariants
+        entry = inv.entry
+
+        # --- TOTAL position size (full idea, if all orders fill) ---
+        total_pos_units = risk * inv.inv_rpu              # units (coins/contracts)
+        total_notional = total_pos_units * entry          # approx position value at entry price
+
+        # --- Split between Entry and DCA ---
+        entry_fraction = 1 - (dca_pct / 100)              # % of size opened at entry
+        dca_fraction = dca_pct / 100                      # % reserved for DCA
+
+        entry_units = total_pos_units * entry_fraction
+        dca_units = total_pos_units * dca_fraction
+
+        entry_notional = entry_units * entry
+        dca_notional = dca_units * entry  # approx; real value uses DCA price on exchange
+
+        # Margin required (for full plan and for entry leg only)
+        margin_full = total_notional * inv.inv_lev
+        margin_entry = entry_notional * inv.inv_lev
+        margin_dca = dca_notional * inv.inv_lev
+
+        # Account risk %
+        account_risk_pct = (risk / account_balance) * 100
+
+        # PnL at target for full planned size
+        pnl_target_full = inv.move_to_target * total_pos_units
+
+        # Risk now (only entry leg filled)
+        risk_entry_only = entry_units * inv.risk_per_unit
+
+        return Sizing(
+            total_pos_units=total_pos_units,
+            total_notional=total_notional,
+            entry_units=entry_units,
+            dca_units=dca_units,
+            entry_notional=entry_notional,
+            dca_notional=dca_notional,
+            margin_full=margin_full,
+            margin_entry=margin_entry,
+            margin_dca=margin_dca,
+            account_risk_pct=account_risk_pct,
+            pnl_target_full=pnl_target_full,
+            risk_entry_only=risk_entry_only,
+        )
@@ -0,0 +1,107 @@
+"""Rendering helpers for the calculator page."""
+from dataclasses import asdict
+
+import streamlit as st
+
+# Result text lives in templates filled from one dict via str.format_map
+_SUMMARY_TEMPLATE = (
+    "{side} **{total_pos_units:.6f} units** "
+    "(full size ≈ ${total_notional:.2f}) • "
+    "Max loss at SL: **${risk:.2f}** "
+    "({account_risk_pct:.2f}% of account) • "
+    "Est. PnL at TP (full size): **${pnl_target_full:.2f}** • "
+    "Full margin @ {leverage}×: **${margin_full:.2f}**"
+)
+
+_DCA_LINE_TEMPLATE = (
+    "📥 **Planned DCA Size:** {dca_units:.8f} units "
+    "(~${dca_notional:.2f} approx) | Margin later: ${margin_dca:.2f} | "
+    "Additional risk when DCA fills: ${dca_extra_risk:.2f}"
+)
+_NO_DCA_LINE = "📥 **DCA:** Not used (100% of size opens at Entry)."
+
+_STOP_LIQ_LINE_TEMPLATE = "🔹 Stop-Loss → Liquidation: {stop_liq_pct:.2f}%\n\n"
+
+_RESULTS_TEMPLATE = (
+    "### 📐 Position Breakdown\n\n"
+    "📥 **Current Entry Size:** {entry_units:.8f} units "
+    "(~${entry_notional:.2f}) | Margin now: ${margin_entry:.2f} | "
+    "Max loss now (if only entry filled): ${risk_entry_only:.2f}\n\n"
+    "{dca_line}\n\n"
+    "### 💸 Risk & Margin\n\n"
+    "💵 **Planned Dollar Risk (full idea):** ${risk:.2f}\n\n"
+    "📊 **Risk as % of account:** {risk_pct:.2f}%\n\n"
+    "💵 **Full Position Margin Required:** ${margin_full:.2f}\n\n"
+    "⚡ **Estimated Liquidation Price:** {liq:.8f}\n\n"
+    "### 📊 Price Distances\n\n"
+    "🔹 Entry → Stop-Loss: {entry_stop_pct:.2f}%\n\n"
+    "🔹 Entry → Liquidation: {entry_liq_pct:.2f}%\n\n"
+    "{stop_liq_line}"
+    "🔹 DCA % of position reserved: {dca_pct:.0f}%"
+)
+
+
+_RR_ALERTS = (
+    (st.error, "🔴 Weak setup: R:R is 1:{risk_reward_ratio:.2f} (< 1:2)."),
+    (st.warning, "🟠 Decent setup: R:R is 1:{risk_reward_ratio:.2f} (around 1:2)."),
+    (st.success, "✅ Strong setup: R:R is 1:{risk_reward_ratio:.2f} (≥ 1:3)."),
+)
+
+# (predicate over (inv, sizing), message); every rule that matches is shown
+_SAFETY_WARNINGS = (
+    (
+        lambda inv, sizing: inv.stop_liq_pct is not None and inv.stop_liq_pct < 1,
+        "⚠️ Liquidation is dangerously close to Stop-Loss — consider lowering leverage.",
+    ),
+    (
+        lambda inv, sizing: sizing.account_risk_pct > 2,
+        "⚠️ Risk exceeds 2% of account — high exposure.",
+    ),
+)
+
+
+def render_results(inv, sizing, col, *, side, leverage, risk, risk_pct, use_dca, dca_pct):
+    """Draw the results panel for the two compute_* results into ``col``."""
+    dca_active = use_dca and dca_pct > 0
+    values = {
+        **asdict(inv),
+        **asdict(sizing),
+        "side": side,
+        "leverage": leverage,
+        "risk": risk,
+        "risk_pct": risk_pct,
+        "dca_pct": dca_pct,
+        "dca_extra_risk": risk - sizing.risk_entry_only,
+    }
+    values["dca_line"] = _DCA_LINE_TEMPLATE.format_map(values) if dca_active else _NO_DCA_LINE
+    values["stop_liq_line"] = (
+        _STOP_LIQ_LINE_TEMPLATE.format_map(values) if inv.stop_liq_pct is not None else ""
+    )
+
+    with col:
+        st.subheader("📈 Results ↔")
+
+        # Quick summary banner
+        st.info(_SUMMARY_TEMPLATE.format_map(values))
+
+        # All result lines go out as one markdown element
+        st.markdown(_RESULTS_TEMPLATE.format_map(values))
+
+        # --- DCA note ---
+        if dca_active:
+            st.info(
+                "🟢 DCA active: Total position size is based on full risk. "
+                "Part is opened at Entry, remaining is reserved for DCA."
+            )
+        else:
+            st.info("⚪ DCA disabled: 100% of planned size opens at Entry.")
+
+        # --- R:R color-coded message (tier 0: < 1:2, 1: around 1:2, 2: >= 1:3) ---
+        rr = inv.risk_reward_ratio
+        level, template = _RR_ALERTS[(rr >= 2) + (rr >= 3)]
+        level(template.format_map(values))
+
+        # --- Other safety warnings ---
+        for applies, message in _SAFETY_WARNINGS:
+            if applies(inv, sizing):
+                st.warning(message)
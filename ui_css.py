@@ -0,0 +1,32 @@
+"""Static CSS for the calculator page."""
+import hashlib
+from typing import Final
+
+import streamlit as st
+
+# --- Custom CSS for input colors ---
+_CSS: Final[str] = """
+    /* Color specific input fields by their label */
+    input[aria-label="Entry Price (USD)"] {
+        background-color: #d4edda !important;   /* Entry - green */
+    }
+    input[aria-label="Stop-Loss Price (USD)"] {
+        background-color: #f8d7da !important;   /* Stop - red */
+    }
+    input[aria-label="Target Price (USD)"] {
+        background-color: #fff3cd !important;   /* Target - orange */
+    }
+"""
+
+
+@st.cache_resource
+def _inject(css: str) -> str:
+    # Keyed on the CSS text, so editing _CSS on a running server misses the cache
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+    return hashlib.sha256(css.encode()).hexdigest()
+
+
+def inject() -> str:
+    """Emit the page CSS; returns its hash, usable as a cache-buster key."""
+    # Cached per server; Streamlit replays the cached markdown on later reruns
+    return _inject(_CSS)